@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Suíte de benchmarks - Sistema Anti-Prompt Injection V2
+Mede detect_injection, a API FastAPI (cliente ASGI em processo) e as
+ferramentas do MCP server, salvando baselines em JSON para comparação.
+
+Uso:
+    python benchmark.py run --profile quick --output baseline.json
+    python benchmark.py compare baseline.json atual.json --tolerance 0.10
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Texto de preenchimento sem nenhuma palavra-chave
+FILLER = "lorem ipsum dolor sit amet consectetur adipiscing elit "
+
+PROFILES = {
+    "quick": {
+        "sizes": [100, 10_000, 1_000_000],
+        "keyword_counts": [10, 1_000],
+        "keyword_set_prompt_size": 1_000,
+        "repeats": 5,
+        "min_time_s": 0.05
+    },
+    "full": {
+        "sizes": [100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000],
+        "keyword_counts": [10, 100, 1_000, 10_000],
+        "keyword_set_prompt_size": 10_000,
+        "repeats": 7,
+        "min_time_s": 0.2
+    }
+}
+
+HIT_POSITIONS = ("early", "late", "none")
+
+
+def build_prompt(size: int, position: str, keyword: str) -> str:
+    """Gera um prompt de `size` caracteres com a palavra-chave na posição pedida"""
+    filler = (FILLER * (size // len(FILLER) + 1))
+    if position == "none":
+        return filler[:size]
+    corpo = filler[:max(0, size - len(keyword) - 1)]
+    if position == "early":
+        return f"{keyword} {corpo}"
+    return f"{corpo} {keyword}"
+
+
+def synthetic_keywords(base: List[str], total: int) -> List[str]:
+    """Completa a lista real com palavras sintéticas que nunca ocorrem no filler"""
+    extras = [f"zqx{i:05d}kw" for i in range(max(0, total - len(base)))]
+    return list(base) + extras
+
+
+def measure(func: Callable[[], object], repeats: int, min_time_s: float) -> Dict:
+    """Mede func com calibração de loops, no estilo timeit (GC desligado)"""
+    loops = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            func()
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= min_time_s * 1e9 or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_time_s * 1e8 else 2
+
+    amostras = []
+    gc_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter_ns()
+            for _ in range(loops):
+                func()
+            amostras.append((time.perf_counter_ns() - start) / loops)
+    finally:
+        if gc_ativo:
+            gc.enable()
+
+    return summarize(amostras, loops)
+
+
+async def measure_coro(make_coro: Callable[[], object], repeats: int, min_time_s: float) -> Dict:
+    """Mede uma corrotina com calibração de loops dentro do event loop atual (GC desligado)"""
+
+    async def executar(loops: int) -> int:
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            await make_coro()
+        return time.perf_counter_ns() - start
+
+    loops = 1
+    while True:
+        elapsed = await executar(loops)
+        if elapsed >= min_time_s * 1e9 or loops >= 100_000:
+            break
+        loops *= 10 if elapsed < min_time_s * 1e8 else 2
+
+    amostras = []
+    gc_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            amostras.append(await executar(loops) / loops)
+    finally:
+        if gc_ativo:
+            gc.enable()
+
+    return summarize(amostras, loops)
+
+
+def measure_async(make_coro: Callable[[], object], repeats: int, min_time_s: float) -> Dict:
+    """Mede uma corrotina em um event loop próprio"""
+    return asyncio.run(measure_coro(make_coro, repeats, min_time_s))
+
+
+def summarize(amostras: List[float], loops: int) -> Dict:
+    ordenadas = sorted(amostras)
+    return {
+        "median_ns": statistics.median(ordenadas),
+        "min_ns": ordenadas[0],
+        "max_ns": ordenadas[-1],
+        "stdev_ns": statistics.stdev(ordenadas) if len(ordenadas) > 1 else 0.0,
+        "loops": loops,
+        "repeats": len(ordenadas)
+    }
+
+
+def bench_detector(profile: Dict) -> Dict[str, Dict]:
+    """detect_injection por tamanho de prompt, posição do acerto e nº de keywords"""
+    import src.detector as detector
+    from src.keywords import KEYWORDS
+
+    results = {}
+    late_keyword = KEYWORDS[-1]  # pior caso da busca sequencial
+
+    for size in profile["sizes"]:
+        for position in HIT_POSITIONS:
+            prompt = build_prompt(size, position, late_keyword)
+            nome = f"detector/size={size}/hit={position}/keywords={len(KEYWORDS)}"
+            results[nome] = measure(lambda: detector.detect_injection(prompt),
+                                    profile["repeats"], profile["min_time_s"])
+            print(f"   {nome}: {results[nome]['median_ns'] / 1000:.2f}µs")
+
+    original = detector.KEYWORDS
+    size = profile["keyword_set_prompt_size"]
+    try:
+        for total in profile["keyword_counts"]:
+            detector.KEYWORDS = synthetic_keywords(original, total)
+            # acerto na última palavra do conjunto, que percorre todas as anteriores
+            ultima = detector.KEYWORDS[-1]
+            for position in HIT_POSITIONS:
+                prompt = build_prompt(size, position, ultima)
+                nome = f"detector/size={size}/hit={position}/keywords={total}"
+                results[nome] = measure(lambda: detector.detect_injection(prompt),
+                                        profile["repeats"], profile["min_time_s"])
+                print(f"   {nome}: {results[nome]['median_ns'] / 1000:.2f}µs")
+    finally:
+        detector.KEYWORDS = original
+
+    return results
+
+
+def bench_api(profile: Dict) -> Dict[str, Dict]:
+    """Endpoint /api/v1/check-prompt via cliente ASGI, sem rede"""
+    import httpx
+    from src.keywords import KEYWORDS
+    from src.main import app
+
+    results = {}
+    # PromptRequest limita o prompt a 10.000 caracteres
+    sizes = [s for s in profile["sizes"] if s <= 10_000]
+
+    async def medir_todos():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for size in sizes:
+                for position in HIT_POSITIONS:
+                    payload = {"prompt": build_prompt(size, position, KEYWORDS[-1])}
+
+                    async def chamada():
+                        response = await client.post("/api/v1/check-prompt", json=payload)
+                        response.raise_for_status()
+
+                    nome = f"api/check-prompt/size={size}/hit={position}"
+                    results[nome] = await measure_coro(chamada, profile["repeats"], profile["min_time_s"])
+                    print(f"   {nome}: {results[nome]['median_ns'] / 1000:.2f}µs")
+
+    asyncio.run(medir_todos())
+    return results
+
+
+def bench_mcp(profile: Dict) -> Dict[str, Dict]:
+    """Ferramentas do MCP server chamadas diretamente, com e sem cache"""
+    import mcp_server
+    from src.keywords import KEYWORDS
+
+    results = {}
+    casos = [
+        ("check_prompt_injection", "prompt", {}),
+        ("analyze_text_safety", "text", {"include_metrics": True})
+    ]
+    max_entries = mcp_server.detection_cache.max_entries
+
+    try:
+        for tool, campo, extras in casos:
+            for size in [s for s in profile["sizes"] if s <= 100_000]:
+                for position in HIT_POSITIONS:
+                    arguments = {campo: build_prompt(size, position, KEYWORDS[-1]), **extras}
+                    for modo, entradas in (("cached", max_entries), ("nocache", 0)):
+                        mcp_server.detection_cache.clear()
+                        mcp_server.detection_cache.max_entries = entradas
+                        nome = f"mcp/{tool}/size={size}/hit={position}/{modo}"
+                        results[nome] = measure_async(
+                            lambda: mcp_server.call_tool(tool, arguments),
+                            profile["repeats"], profile["min_time_s"]
+                        )
+                        print(f"   {nome}: {results[nome]['median_ns'] / 1000:.2f}µs")
+    finally:
+        mcp_server.detection_cache.max_entries = max_entries
+        mcp_server.detection_cache.clear()
+
+    return results
+
+
+GROUPS = {
+    "detector": bench_detector,
+    "api": bench_api,
+    "mcp": bench_mcp
+}
+
+
+def run(args) -> int:
+    profile = PROFILES[args.profile]
+    groups = args.only.split(",") if args.only else list(GROUPS)
+
+    print("⏱️  BENCHMARKS - ANTI-PROMPT INJECTION V2")
+    print("=" * 60)
+
+    results: Dict[str, Dict] = {}
+    for group in groups:
+        print(f"\n📋 {group.upper()}")
+        try:
+            results.update(GROUPS[group](profile))
+        except ImportError as e:
+            print(f"   ⚠️ Grupo ignorado, dependência ausente: {e}")
+        except Exception as e:
+            # uma falha no grupo não descarta os resultados já medidos
+            print(f"   ❌ Grupo {group} falhou e foi ignorado: {type(e).__name__}: {e}")
+
+    baseline = {
+        "metadata": {
+            "profile": args.profile,
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        },
+        "results": results
+    }
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+
+    print(f"\n💾 {len(results)} resultados salvos em {args.output}")
+    return 0
+
+
+def compare(args) -> int:
+    with open(args.baseline, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        atual = json.load(f)
+
+    if base["metadata"].get("platform") != atual["metadata"].get("platform"):
+        print("⚠️ Baselines gerados em plataformas diferentes; comparação indicativa")
+
+    regressoes = []
+    print(f"{'caso':<70} {'base':>10} {'atual':>10} {'razão':>7}")
+    for nome in sorted(set(base["results"]) & set(atual["results"])):
+        antes = base["results"][nome]["median_ns"]
+        depois = atual["results"][nome]["median_ns"]
+        razao = depois / antes if antes else float("inf")
+        marca = ""
+        if razao > 1 + args.tolerance:
+            marca = " 🔴"
+            regressoes.append(nome)
+        elif razao < 1 - args.tolerance:
+            marca = " 🟢"
+        print(f"{nome:<70} {antes / 1000:>8.2f}µs {depois / 1000:>8.2f}µs {razao:>6.2f}x{marca}")
+
+    ausentes = sorted(set(base["results"]) - set(atual["results"]))
+    if ausentes:
+        print(f"\n⚠️ {len(ausentes)} casos do baseline não foram medidos")
+
+    if regressoes:
+        print(f"\n❌ {len(regressoes)} regressões acima de {args.tolerance:.0%}")
+        return 1
+
+    print(f"\n✅ Nenhuma regressão acima de {args.tolerance:.0%}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks do Sistema Anti-Prompt Injection V2")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Executa os benchmarks e salva o baseline em JSON")
+    p_run.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    p_run.add_argument("--only", help=f"Grupos separados por vírgula ({','.join(GROUPS)})")
+    p_run.add_argument("--output", default="benchmark_results.json")
+    p_run.set_defaults(func=run)
+
+    p_cmp = sub.add_parser("compare", help="Compara dois baselines e aponta regressões")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--tolerance", type=float, default=0.10,
+                       help="Aumento relativo da mediana tolerado (padrão 0.10)")
+    p_cmp.set_defaults(func=compare)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
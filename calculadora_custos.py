@@ -4,69 +4,83 @@ Calculadora de Custos - Sistema Anti-Prompt Injection V2
 Calcula custos AWS baseado em diferentes cenários de uso
 """
 
-def calcular_custos_aws(tasks=2, requests_por_dia=5000, regiao="us-east-1", ambiente="producao"):
+import argparse
+import json
+import math
+import time
+
+# Combinações de task Fargate (vCPU, memória GB) consideradas no planejamento
+TAMANHOS_FARGATE = [
+    (0.25, 0.5),
+    (0.25, 1.0),
+    (0.5, 1.0),
+    (1.0, 2.0),
+    (2.0, 4.0),
+    (4.0, 8.0)
+]
+
+# Tamanho da task definido no Terraform (task_cpu=256, task_memory=512)
+VCPU_PADRAO = 0.25
+MEMORY_PADRAO_GB = 0.5
+
+# Preços base (us-east-1)
+PRECOS = {
+    "fargate_vcpu_hora": 0.04048,      # $/vCPU/hora
+    "fargate_memory_hora": 0.004445,   # $/GB/hora
+    "alb_fixo": 16.20,                 # $/mês
+    "alb_lcu_hora": 0.008,             # $/LCU/hora
+    "ecr_storage": 0.10,               # $/GB/mês
+    "cloudwatch_ingestao": 0.50,       # $/GB
+    "cloudwatch_storage": 0.03,        # $/GB/mês
+    "data_transfer": 0.09              # $/GB
+}
+
+# Multiplicadores por região
+MULTIPLICADORES_REGIAO = {
+    "us-east-1": 1.0,
+    "us-west-2": 1.0,
+    "eu-west-1": 1.1,
+    "sa-east-1": 1.3
+}
+
+HORAS_MES = 744  # 24h × 31 dias
+
+def storage_ecr_gb(ambiente):
+    """Armazenamento de imagens no ECR por ambiente"""
+    return 0.5 if ambiente == "dev" else 1.0
+
+def _componentes_custo(tasks, requests_por_dia, mult_regiao, vcpu_por_task, memory_por_task_gb,
+                       storage_gb, maximo=max):
     """
-    Calcula custos mensais AWS para o sistema
+    Fórmulas de custo mensal, válidas para escalares e arrays NumPy
     
-    Args:
-        tasks: Número de tasks ECS Fargate
-        requests_por_dia: Número de requests por dia
-        regiao: Região AWS
-        ambiente: Tipo de ambiente (dev, staging, producao)
+    `maximo` é `max` no caso escalar e `numpy.maximum` no vetorizado.
     """
-    
-    # Preços base (us-east-1)
-    precos = {
-        "fargate_vcpu_hora": 0.04048,      # $/vCPU/hora
-        "fargate_memory_hora": 0.004445,   # $/GB/hora
-        "alb_fixo": 16.20,                 # $/mês
-        "alb_lcu_hora": 0.008,             # $/LCU/hora
-        "ecr_storage": 0.10,               # $/GB/mês
-        "cloudwatch_ingestao": 0.50,       # $/GB
-        "cloudwatch_storage": 0.03,        # $/GB/mês
-        "data_transfer": 0.09              # $/GB
-    }
-    
-    # Multiplicadores por região
-    multiplicadores_regiao = {
-        "us-east-1": 1.0,
-        "us-west-2": 1.0,
-        "eu-west-1": 1.1,
-        "sa-east-1": 1.3
-    }
-    
-    mult_regiao = multiplicadores_regiao.get(regiao, 1.0)
-    horas_mes = 744  # 24h × 31 dias
-    
     # Cálculo ECS Fargate
-    vcpu_por_task = 0.25
-    memory_por_task_gb = 0.5
-    
-    custo_fargate_vcpu = tasks * vcpu_por_task * horas_mes * precos["fargate_vcpu_hora"] * mult_regiao
-    custo_fargate_memory = tasks * memory_por_task_gb * horas_mes * precos["fargate_memory_hora"] * mult_regiao
+    custo_fargate_vcpu = tasks * vcpu_por_task * HORAS_MES * PRECOS["fargate_vcpu_hora"] * mult_regiao
+    custo_fargate_memory = tasks * memory_por_task_gb * HORAS_MES * PRECOS["fargate_memory_hora"] * mult_regiao
     custo_fargate_total = custo_fargate_vcpu + custo_fargate_memory
     
     # Cálculo ALB
     requests_mes = requests_por_dia * 31
-    lcu_estimado = max(1, requests_mes / 100000)  # 1 LCU = ~100k requests
+    lcu_estimado = maximo(1, requests_mes / 100000)  # 1 LCU = ~100k requests
     
-    custo_alb_fixo = precos["alb_fixo"] * mult_regiao
-    custo_alb_lcu = lcu_estimado * horas_mes * precos["alb_lcu_hora"] * mult_regiao
+    custo_alb_fixo = PRECOS["alb_fixo"] * mult_regiao
+    custo_alb_lcu = lcu_estimado * HORAS_MES * PRECOS["alb_lcu_hora"] * mult_regiao
     custo_alb_total = custo_alb_fixo + custo_alb_lcu
     
     # Cálculo ECR
-    storage_gb = 0.5 if ambiente == "dev" else 1.0
-    custo_ecr = storage_gb * precos["ecr_storage"] * mult_regiao
+    custo_ecr = storage_gb * PRECOS["ecr_storage"] * mult_regiao
     
     # Cálculo CloudWatch
     logs_gb_mes = requests_mes / 10000  # ~10k requests = 1GB logs
-    custo_cw_ingestao = logs_gb_mes * precos["cloudwatch_ingestao"] * mult_regiao
-    custo_cw_storage = logs_gb_mes * precos["cloudwatch_storage"] * mult_regiao
+    custo_cw_ingestao = logs_gb_mes * PRECOS["cloudwatch_ingestao"] * mult_regiao
+    custo_cw_storage = logs_gb_mes * PRECOS["cloudwatch_storage"] * mult_regiao
     custo_cloudwatch_total = custo_cw_ingestao + custo_cw_storage
     
     # Cálculo Data Transfer
     data_gb_mes = requests_mes / 50000  # ~50k requests = 1GB transfer
-    custo_data_transfer = data_gb_mes * precos["data_transfer"] * mult_regiao
+    custo_data_transfer = data_gb_mes * PRECOS["data_transfer"] * mult_regiao
     
     # Total
     custo_total_mensal = (
@@ -84,10 +98,47 @@ def calcular_custos_aws(tasks=2, requests_por_dia=5000, regiao="us-east-1", ambi
         "cloudwatch": custo_cloudwatch_total,
         "data_transfer": custo_data_transfer,
         "total_mensal": custo_total_mensal,
+        "requests_mes": requests_mes
+    }
+
+def calcular_custos_aws(tasks=2, requests_por_dia=5000, regiao="us-east-1", ambiente="producao",
+                        vcpu_por_task=VCPU_PADRAO, memory_por_task_gb=MEMORY_PADRAO_GB):
+    """
+    Calcula custos mensais AWS para o sistema
+    
+    Args:
+        tasks: Número de tasks ECS Fargate
+        requests_por_dia: Número de requests por dia
+        regiao: Região AWS
+        ambiente: Tipo de ambiente (dev, staging, producao)
+        vcpu_por_task: vCPUs de cada task Fargate
+        memory_por_task_gb: Memória (GB) de cada task Fargate
+    """
+    
+    custos = _componentes_custo(
+        tasks,
+        requests_por_dia,
+        MULTIPLICADORES_REGIAO.get(regiao, 1.0),
+        vcpu_por_task,
+        memory_por_task_gb,
+        storage_ecr_gb(ambiente)
+    )
+    requests_mes = custos["requests_mes"]
+    custo_total_mensal = custos["total_mensal"]
+    
+    return {
+        "fargate": custos["fargate"],
+        "alb": custos["alb"],
+        "ecr": custos["ecr"],
+        "cloudwatch": custos["cloudwatch"],
+        "data_transfer": custos["data_transfer"],
+        "total_mensal": custo_total_mensal,
         "total_anual": custo_total_mensal * 12,
         "custo_por_request": custo_total_mensal / requests_mes if requests_mes > 0 else 0,
         "detalhes": {
             "tasks": tasks,
+            "vcpu_por_task": vcpu_por_task,
+            "memory_por_task_gb": memory_por_task_gb,
             "requests_dia": requests_por_dia,
             "requests_mes": requests_mes,
             "regiao": regiao,
@@ -95,6 +146,484 @@ def calcular_custos_aws(tasks=2, requests_por_dia=5000, regiao="us-east-1", ambi
         }
     }
 
+def carregar_medicoes(caminho):
+    """
+    Lê medições de throughput/latência por task
+    
+    Aceita o resumo gerado por `demo.py --output` (ou uma lista deles). A
+    capacidade vem da vazão obtida (success_rps: respostas 200 concluídas por
+    segundo), não da taxa oferecida (offered_rps), que em malha aberta não
+    cai quando a API satura. Cada execução precisa de latency_ms.p99 e dos
+    campos "vcpu" e "memory_gb" com o tamanho da task medida (`demo.py
+    --vcpu ... --memory-gb ...`): uma medição local roda com um núcleo
+    inteiro e superestimaria a capacidade de uma task menor.
+    """
+    with open(caminho, encoding="utf-8") as f:
+        dados = json.load(f)
+    
+    execucoes = dados if isinstance(dados, list) else [dados]
+    medicoes = []
+    for i, execucao in enumerate(execucoes, 1):
+        throughput = execucao.get("success_rps", execucao.get("throughput_rps"))
+        if not isinstance(throughput, (int, float)) or throughput < 0:
+            raise ValueError(f"{caminho}: execução {i} sem success_rps/throughput_rps válido")
+        p99 = (execucao.get("latency_ms") or {}).get("p99")
+        if not isinstance(p99, (int, float)) or p99 < 0:
+            raise ValueError(f"{caminho}: execução {i} sem latency_ms.p99 válido")
+        if "vcpu" not in execucao or "memory_gb" not in execucao:
+            raise ValueError(
+                f"{caminho}: execução {i} não informa o tamanho da task medida; "
+                "gere a medição com demo.py --vcpu N --memory-gb N"
+            )
+        medicoes.append({
+            "throughput_rps": throughput,
+            "p99_ms": p99,
+            "vcpu": float(execucao["vcpu"]),
+            "memory_gb": float(execucao["memory_gb"])
+        })
+    return medicoes
+
+def capacidade_por_task(medicoes, p99_alvo_ms, vcpu, memory_gb):
+    """
+    Maior throughput por task que respeita o p99 alvo
+    
+    Tamanhos medidos usam a medição diretamente. Os demais são extrapolados
+    da medição de vCPU mais próxima pela fração de vCPU utilizável: o uvicorn
+    roda um único processo, que não passa de 1 vCPU.
+    """
+    validas = [m for m in medicoes if m["p99_ms"] <= p99_alvo_ms]
+    if not validas:
+        return 0.0
+    
+    mesmas = [m for m in validas if m["vcpu"] == vcpu and m["memory_gb"] == memory_gb]
+    if mesmas:
+        return max(m["throughput_rps"] for m in mesmas)
+    
+    distancia = min(abs(math.log(vcpu / m["vcpu"])) for m in validas)
+    return max(
+        m["throughput_rps"] * min(vcpu, 1.0) / min(m["vcpu"], 1.0)
+        for m in validas
+        if math.isclose(abs(math.log(vcpu / m["vcpu"])), distancia)
+    )
+
+def planejar_capacidade(medicoes, requests_por_dia, p99_alvo_ms=100, pico_sobre_media=3.0,
+                        regiao="us-east-1", ambiente="producao", utilizacao_alvo=0.7):
+    """
+    Dimensiona e precifica o cluster a partir de throughput medido
+    
+    Args:
+        medicoes: Lista de medições (ver carregar_medicoes)
+        requests_por_dia: Volume médio diário
+        p99_alvo_ms: Latência p99 máxima aceita por task
+        pico_sobre_media: Razão entre o RPS de pico e o RPS médio
+        regiao: Região AWS
+        ambiente: Tipo de ambiente (dev, staging, producao)
+        utilizacao_alvo: Fração da capacidade medida usada no pico (folga)
+    
+    Returns:
+        Dict com a opção mais barata e todas as opções avaliadas
+    """
+    rps_medio = requests_por_dia / 86400
+    rps_pico = rps_medio * pico_sobre_media
+    minimo_tasks = 2 if ambiente == "producao" else 1  # 2 AZs em produção
+    
+    opcoes = []
+    for vcpu, memory_gb in TAMANHOS_FARGATE:
+        capacidade = capacidade_por_task(medicoes, p99_alvo_ms, vcpu, memory_gb)
+        if capacidade <= 0:
+            continue
+        
+        tasks = max(minimo_tasks, math.ceil(rps_pico / (capacidade * utilizacao_alvo)))
+        custos = calcular_custos_aws(
+            tasks=tasks,
+            requests_por_dia=requests_por_dia,
+            regiao=regiao,
+            ambiente=ambiente,
+            vcpu_por_task=vcpu,
+            memory_por_task_gb=memory_gb
+        )
+        opcoes.append({
+            "vcpu": vcpu,
+            "memory_gb": memory_gb,
+            "capacidade_rps_task": capacidade,
+            "tasks": tasks,
+            "custos": custos
+        })
+    
+    if not opcoes:
+        raise ValueError(f"Nenhuma medição atinge o p99 alvo de {p99_alvo_ms}ms")
+    
+    opcoes.sort(key=lambda o: o["custos"]["total_mensal"])
+    return {
+        "rps_medio": rps_medio,
+        "rps_pico": rps_pico,
+        "p99_alvo_ms": p99_alvo_ms,
+        "pico_sobre_media": pico_sobre_media,
+        "utilizacao_alvo": utilizacao_alvo,
+        "recomendada": opcoes[0],
+        "opcoes": opcoes
+    }
+
+def _importar_numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        raise SystemExit("❌ A varredura vetorizada requer NumPy: pip install numpy")
+    return np
+
+def varrer_cenarios(tasks, requests_por_dia, regioes=None, tamanhos=None, ambientes=None,
+                    receita_por_request=None):
+    """
+    Precifica a grade completa de cenários de uma só vez (NumPy)
+    
+    Cada eixo vira uma dimensão de um array e as fórmulas de
+    calcular_custos_aws são aplicadas por broadcasting, sem laços Python.
+    
+    Args:
+        tasks: Números de tasks a avaliar
+        requests_por_dia: Volumes diários a avaliar (em ordem crescente)
+        regioes: Regiões AWS (padrão: todas de MULTIPLICADORES_REGIAO)
+        tamanhos: Pares (vCPU, memória GB) (padrão: TAMANHOS_FARGATE)
+        ambientes: Ambientes (padrão: dev, staging, producao)
+        receita_por_request: Se informado, calcula o volume diário mínimo em
+            que o custo por request fica abaixo desse valor (ponto de equilíbrio)
+    
+    Returns:
+        Dict com os eixos, a superfície de custo (shape tasks × requests ×
+        região × tamanho × ambiente) por componente e os pontos de equilíbrio
+    """
+    np = _importar_numpy()
+    
+    regioes = list(regioes or MULTIPLICADORES_REGIAO)
+    tamanhos = list(tamanhos or TAMANHOS_FARGATE)
+    ambientes = list(ambientes or ["dev", "staging", "producao"])
+    
+    eixo_tasks = np.asarray(tasks)
+    eixo_requests = np.asarray(requests_por_dia, dtype=float)
+    if np.any(np.diff(eixo_requests) < 0):
+        raise ValueError("requests_por_dia deve estar em ordem crescente")
+    
+    componentes = _componentes_custo(
+        eixo_tasks.reshape(-1, 1, 1, 1, 1),
+        eixo_requests.reshape(1, -1, 1, 1, 1),
+        np.array([MULTIPLICADORES_REGIAO.get(r, 1.0) for r in regioes]).reshape(1, 1, -1, 1, 1),
+        np.array([v for v, _ in tamanhos], dtype=float).reshape(1, 1, 1, -1, 1),
+        np.array([m for _, m in tamanhos], dtype=float).reshape(1, 1, 1, -1, 1),
+        np.array([storage_ecr_gb(a) for a in ambientes]).reshape(1, 1, 1, 1, -1),
+        maximo=np.maximum
+    )
+    
+    shape = (len(eixo_tasks), len(eixo_requests), len(regioes), len(tamanhos), len(ambientes))
+    superficie = {nome: np.broadcast_to(valor, shape) for nome, valor in componentes.items()}
+    requests_mes = superficie["requests_mes"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        superficie["custo_por_request"] = np.where(
+            requests_mes > 0, superficie["total_mensal"] / requests_mes, 0.0
+        )
+    
+    resultado = {
+        "eixos": {
+            "tasks": eixo_tasks,
+            "requests_por_dia": eixo_requests,
+            "regioes": regioes,
+            "tamanhos": tamanhos,
+            "ambientes": ambientes
+        },
+        "superficie": superficie,
+        "pontos": int(np.prod(shape))
+    }
+    
+    if receita_por_request is not None:
+        # Custo por request decresce com o volume: o primeiro ponto abaixo da
+        # receita no eixo de requests é o ponto de equilíbrio
+        lucrativo = superficie["custo_por_request"] <= receita_por_request
+        lucrativo &= requests_mes > 0
+        indice = lucrativo.argmax(axis=1)
+        resultado["equilibrio_requests_dia"] = np.where(
+            lucrativo.any(axis=1), eixo_requests[indice], np.nan
+        )
+    
+    return resultado
+
+# Colunas exportadas, no padrão de custos_detalhados.csv
+COLUNAS_EXPORTACAO = [
+    ("ECS Fargate", "fargate"),
+    ("Load Balancer", "alb"),
+    ("ECR Storage", "ecr"),
+    ("CloudWatch", "cloudwatch"),
+    ("Data Transfer", "data_transfer"),
+    ("Total Mensal", "total_mensal")
+]
+
+def tabela_varredura(resultado):
+    """Achata a superfície de custo em colunas (uma linha por cenário)"""
+    np = _importar_numpy()
+    
+    eixos = resultado["eixos"]
+    superficie = resultado["superficie"]
+    shape = superficie["total_mensal"].shape
+    it, ir, ig, isz, ia = np.indices(shape).reshape(5, -1)
+    tamanhos = np.array(eixos["tamanhos"], dtype=float)
+    
+    colunas = {
+        "Tasks": eixos["tasks"][it],
+        "vCPU": tamanhos[isz, 0],
+        "Memória GB": tamanhos[isz, 1],
+        "Região": np.array(eixos["regioes"])[ig],
+        "Ambiente": np.array(eixos["ambientes"])[ia],
+        "Requests/Dia": eixos["requests_por_dia"][ir],
+        "Requests/Mês": superficie["requests_mes"].ravel()
+    }
+    for nome, chave in COLUNAS_EXPORTACAO:
+        colunas[nome] = superficie[chave].ravel()
+    colunas["Total Anual"] = colunas["Total Mensal"] * 12
+    colunas["Custo por Request"] = superficie["custo_por_request"].ravel()
+    return colunas
+
+def exportar_varredura(resultado, caminho):
+    """Exporta a grade para CSV ou Parquet (pela extensão do arquivo)"""
+    colunas = tabela_varredura(resultado)
+    
+    if caminho.endswith(".parquet"):
+        try:
+            import pandas as pd
+            pd.DataFrame(colunas).to_parquet(caminho, index=False)
+        except ImportError:
+            raise SystemExit("❌ Exportação Parquet requer pandas e pyarrow: pip install pandas pyarrow")
+        return
+    
+    import csv
+    nomes = list(colunas)
+    valores = [colunas[nome].tolist() for nome in nomes]
+    with open(caminho, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(nomes)
+        writer.writerows(zip(*valores))
+
+def exibir_varredura(resultado, tempo_s, receita_por_request=None):
+    """Resumo da superfície de custo e dos pontos de equilíbrio"""
+    np = _importar_numpy()
+    
+    eixos = resultado["eixos"]
+    total = resultado["superficie"]["total_mensal"]
+    
+    print("🧮 VARREDURA DE CENÁRIOS - ANTI-PROMPT INJECTION V2")
+    print("=" * 60)
+    print(f"   • Cenários:     {resultado['pontos']:,} "
+          f"({' × '.join(str(n) for n in total.shape)})")
+    print(f"   • Tempo:        {tempo_s * 1000:.1f}ms")
+    print(f"   • Custo mensal: ${total.min():,.2f} a ${total.max():,.2f}")
+    
+    # Sensibilidade: variação do custo ao longo de cada eixo, na mediana dos demais
+    print(f"\n📈 Sensibilidade (variação do custo mensal ao longo de cada eixo):")
+    nomes_eixos = ["Tasks", "Requests/dia", "Região", "Tamanho", "Ambiente"]
+    centro = tuple(n // 2 for n in total.shape)
+    for eixo, nome in enumerate(nomes_eixos):
+        fatia = list(centro)
+        fatia[eixo] = slice(None)
+        valores = total[tuple(fatia)]
+        print(f"   • {nome:<13} ${valores.min():>12,.2f} → ${valores.max():>12,.2f}")
+    
+    if receita_por_request is None:
+        return
+    
+    equilibrio = resultado["equilibrio_requests_dia"]
+    print(f"\n⚖️  Ponto de equilíbrio (receita ${receita_por_request:g}/request, "
+          f"tamanho {eixos['tamanhos'][0][0]:g} vCPU, {eixos['regioes'][0]}):")
+    for ia, ambiente in enumerate(eixos["ambientes"]):
+        for it, tasks in enumerate(eixos["tasks"]):
+            valor = equilibrio[it, 0, 0, ia]
+            texto = f"{valor:,.0f} requests/dia" if not np.isnan(valor) else "fora da grade"
+            print(f"   • {ambiente:<9} {tasks:>4g} task(s): {texto}")
+
+def _perfil_dia(np, rng, meses, dia, pico_hora, amplitude_diaria, fator_fim_de_semana,
+                sigma_dia, sigma_hora, sigma_minuto, prob_burst, duracao_burst_min, intensidade_burst):
+    """Fator de tráfego minuto a minuto (média 1) de um dia para todos os meses"""
+    minutos = np.arange(1440)
+    diurno = 1 + amplitude_diaria * np.cos(2 * np.pi * (minutos / 1440 - pico_hora / 24))
+    
+    semana = fator_fim_de_semana if dia % 7 in (5, 6) else 1.0
+    semana /= (5 + 2 * fator_fim_de_semana) / 7  # preserva a média semanal
+    
+    def lognormal(sigma, shape):
+        return np.exp(sigma * rng.standard_normal(shape) - sigma ** 2 / 2)
+    
+    fator = (
+        diurno * semana
+        * lognormal(sigma_dia, (meses, 1))
+        * np.repeat(lognormal(sigma_hora, (meses, 24)), 60, axis=1)
+        * lognormal(sigma_minuto, (meses, 1440))
+    )
+    
+    # Rajadas: no máximo uma por dia, com início e intensidade aleatórios
+    tem_burst = rng.random((meses, 1)) < prob_burst
+    inicio = rng.integers(0, 1440, (meses, 1))
+    no_burst = tem_burst & (minutos >= inicio) & (minutos < inicio + duracao_burst_min)
+    multiplicador = 1 + rng.exponential(intensidade_burst, (meses, 1))
+    return np.where(no_burst, fator * multiplicador, fator)
+
+def simular_trafego(requests_por_dia, capacidade_rps_task, meses=1000, regiao="us-east-1",
+                    ambiente="producao", vcpu_por_task=VCPU_PADRAO, memory_por_task_gb=MEMORY_PADRAO_GB,
+                    min_tasks=None, max_tasks=50, utilizacao_alvo=0.7, atraso_scale_out_min=3,
+                    cooldown_scale_in_min=15, pico_hora=14, amplitude_diaria=0.6,
+                    fator_fim_de_semana=0.6, sigma_dia=0.15, sigma_hora=0.2, sigma_minuto=0.1,
+                    prob_burst=0.1, duracao_burst_min=30, intensidade_burst=2.0, seed=42):
+    """
+    Simulação Monte Carlo de meses de tráfego contra o autoscaling do ECS
+    
+    O tráfego por minuto segue um perfil diurno (pico às `pico_hora`), queda
+    no fim de semana, ruído lognormal por dia/hora/minuto e rajadas. A cada
+    minuto a política de target tracking calcula as tasks desejadas para
+    manter `utilizacao_alvo`; novas tasks só atendem após
+    `atraso_scale_out_min` e o scale-in respeita `cooldown_scale_in_min`.
+    Minutos com carga acima da capacidade (medida no p99 alvo) contam como
+    violação de SLO.
+    
+    Todos os meses avançam juntos em arrays NumPy; o laço Python percorre
+    apenas os minutos de um mês.
+    
+    Returns:
+        Dict com arrays por mês simulado: custo_mensal, minutos_violacao,
+        task_horas, pico_tasks e requests_mes
+    """
+    np = _importar_numpy()
+    rng = np.random.default_rng(seed)
+    
+    if min_tasks is None:
+        min_tasks = 2 if ambiente == "producao" else 1
+    atraso = max(1, int(atraso_scale_out_min))
+    rps_medio = requests_por_dia / 86400
+    capacidade_alvo = capacidade_rps_task * utilizacao_alvo
+    
+    rodando = np.full(meses, min_tasks, dtype=np.int64)
+    pendentes = np.zeros((atraso, meses), dtype=np.int64)
+    em_espera = np.zeros(meses, dtype=np.int64)
+    ultimo_ajuste = np.zeros(meses, dtype=np.int64)
+    task_minutos = np.zeros(meses, dtype=np.int64)
+    pico_tasks = rodando.copy()
+    minutos_violacao = np.zeros(meses, dtype=np.int64)
+    requests_mes = np.zeros(meses)
+    
+    t = 0
+    for dia in range(31):
+        carga_dia = rps_medio * _perfil_dia(
+            np, rng, meses, dia, pico_hora, amplitude_diaria, fator_fim_de_semana,
+            sigma_dia, sigma_hora, sigma_minuto, prob_burst, duracao_burst_min, intensidade_burst
+        )
+        requests_mes += carga_dia.sum(axis=1) * 60
+        desejadas_dia = np.clip(np.ceil(carga_dia / capacidade_alvo), min_tasks, max_tasks).astype(np.int64)
+        # Minuto como primeiro eixo: cada passo lê uma linha contígua
+        carga_dia = np.ascontiguousarray(carga_dia.T)
+        desejadas_dia = np.ascontiguousarray(desejadas_dia.T)
+        
+        for minuto in range(1440):
+            slot = t % atraso
+            rodando += pendentes[slot]
+            em_espera -= pendentes[slot]
+            pendentes[slot] = 0
+            
+            carga = carga_dia[minuto]
+            minutos_violacao += carga > rodando * capacidade_rps_task
+            task_minutos += rodando
+            np.maximum(pico_tasks, rodando, out=pico_tasks)
+            
+            # Target tracking sobre a métrica do minuto
+            desejadas = desejadas_dia[minuto]
+            faltam = desejadas - rodando - em_espera
+            scale_out = faltam > 0
+            lancadas = np.maximum(faltam, 0)
+            pendentes[slot] += lancadas
+            em_espera += lancadas
+            
+            scale_in = (
+                (desejadas < rodando) & (em_espera == 0)
+                & (t - ultimo_ajuste >= cooldown_scale_in_min)
+            )
+            np.copyto(rodando, desejadas, where=scale_in)
+            np.copyto(ultimo_ajuste, t, where=scale_out | scale_in)
+            t += 1
+    
+    mult_regiao = MULTIPLICADORES_REGIAO.get(regiao, 1.0)
+    task_horas = task_minutos / 60
+    custo_fargate = task_horas * mult_regiao * (
+        vcpu_por_task * PRECOS["fargate_vcpu_hora"] + memory_por_task_gb * PRECOS["fargate_memory_hora"]
+    )
+    # Demais componentes dependem só do volume: tasks=0 zera a parcela Fargate
+    demais = _componentes_custo(0, requests_mes / 31, mult_regiao, vcpu_por_task, memory_por_task_gb,
+                                storage_ecr_gb(ambiente), maximo=np.maximum)
+    
+    return {
+        "custo_mensal": custo_fargate + demais["total_mensal"],
+        "custo_fargate": custo_fargate,
+        "minutos_violacao": minutos_violacao,
+        "task_horas": task_horas,
+        "pico_tasks": pico_tasks,
+        "requests_mes": requests_mes,
+        "parametros": {
+            "requests_por_dia": requests_por_dia,
+            "capacidade_rps_task": capacidade_rps_task,
+            "meses": meses,
+            "regiao": regiao,
+            "ambiente": ambiente,
+            "vcpu_por_task": vcpu_por_task,
+            "memory_por_task_gb": memory_por_task_gb,
+            "min_tasks": min_tasks,
+            "max_tasks": max_tasks,
+            "utilizacao_alvo": utilizacao_alvo
+        }
+    }
+
+def exibir_simulacao(simulacao, tempo_s):
+    """Percentis de custo e de violação de SLO dos meses simulados"""
+    np = _importar_numpy()
+    
+    parametros = simulacao["parametros"]
+    percentis = [5, 50, 95, 99]
+    
+    print("🎲 SIMULAÇÃO MONTE CARLO - ANTI-PROMPT INJECTION V2")
+    print("=" * 60)
+    print(f"   • Meses simulados:  {parametros['meses']:,} em {tempo_s:.2f}s")
+    print(f"   • Requests/dia:     {parametros['requests_por_dia']:,} (média)")
+    print(f"   • Capacidade/task:  {parametros['capacidade_rps_task']:,.1f} req/s "
+          f"({parametros['vcpu_por_task']:g} vCPU / {parametros['memory_por_task_gb']:g}GB)")
+    print(f"   • Autoscaling:      {parametros['min_tasks']}-{parametros['max_tasks']} tasks, "
+          f"alvo {parametros['utilizacao_alvo']:.0%}")
+    
+    print(f"\n{'':<22}" + "".join(f"{'p' + str(p):>12}" for p in percentis))
+    linhas = [
+        ("Custo mensal ($)", simulacao["custo_mensal"], "{:>12,.2f}"),
+        ("Fargate ($)", simulacao["custo_fargate"], "{:>12,.2f}"),
+        ("Task-horas", simulacao["task_horas"], "{:>12,.0f}"),
+        ("Pico de tasks", simulacao["pico_tasks"], "{:>12,.0f}"),
+        ("Minutos violando SLO", simulacao["minutos_violacao"], "{:>12,.0f}")
+    ]
+    for nome, valores, formato in linhas:
+        print(f"{nome:<22}" + "".join(formato.format(v) for v in np.percentile(valores, percentis)))
+    
+    meses_com_violacao = np.mean(simulacao["minutos_violacao"] > 0)
+    print(f"\n   • Meses com alguma violação de SLO: {meses_com_violacao:.1%}")
+
+def exibir_planejamento(plano):
+    """Exibe o dimensionamento e a opção recomendada"""
+    
+    print("📐 PLANEJAMENTO DE CAPACIDADE - ANTI-PROMPT INJECTION V2")
+    print("=" * 60)
+    print(f"   • RPS médio:        {plano['rps_medio']:,.2f}")
+    print(f"   • RPS de pico:      {plano['rps_pico']:,.2f} ({plano['pico_sobre_media']:g}x a média)")
+    print(f"   • p99 alvo:         {plano['p99_alvo_ms']:g}ms")
+    print(f"   • Utilização alvo:  {plano['utilizacao_alvo']:.0%}")
+    
+    print(f"\n{'Task':<14} {'RPS/task':>10} {'Tasks':>6} {'Mensal':>10}")
+    for opcao in plano["opcoes"]:
+        tamanho = f"{opcao['vcpu']:g} vCPU/{opcao['memory_gb']:g}GB"
+        print(f"{tamanho:<14} {opcao['capacidade_rps_task']:>10,.1f} {opcao['tasks']:>6} "
+              f"${opcao['custos']['total_mensal']:>9.2f}")
+    
+    recomendada = plano["recomendada"]
+    print(f"\n✅ Recomendado: {recomendada['tasks']} task(s) de "
+          f"{recomendada['vcpu']:g} vCPU / {recomendada['memory_gb']:g}GB\n")
+    exibir_relatorio(recomendada["custos"])
+
 def exibir_relatorio(resultado):
     """Exibe relatório formatado dos custos"""
     
@@ -103,7 +632,7 @@ def exibir_relatorio(resultado):
     
     detalhes = resultado["detalhes"]
     print(f"📊 Configuração:")
-    print(f"   • Tasks ECS: {detalhes['tasks']}")
+    print(f"   • Tasks ECS: {detalhes['tasks']} ({detalhes['vcpu_por_task']:g} vCPU / {detalhes['memory_por_task_gb']:g}GB)")
     print(f"   • Requests/dia: {detalhes['requests_dia']:,}")
     print(f"   • Requests/mês: {detalhes['requests_mes']:,}")
     print(f"   • Região: {detalhes['regiao']}")
@@ -206,5 +735,101 @@ def main():
     print("• Monitorar uso e escalar conforme demanda")
     print("• Considerar Savings Plans após 6 meses")
 
+def cli():
+    """Executa os cenários predefinidos ou o planejamento de capacidade"""
+    
+    parser = argparse.ArgumentParser(description="Calculadora de custos AWS - Anti-Prompt Injection V2")
+    parser.add_argument("--capacidade", metavar="RESULTADOS_JSON",
+                        help="Planejar a partir de medições de carga (saída de demo.py --output)")
+    parser.add_argument("--requests-dia", type=int, default=5000)
+    parser.add_argument("--p99-alvo", type=float, default=100, help="p99 alvo em ms")
+    parser.add_argument("--pico", type=float, default=3.0, help="Razão pico/média do tráfego")
+    parser.add_argument("--utilizacao", type=float, default=0.7, help="Utilização alvo no pico")
+    parser.add_argument("--regiao", default="us-east-1")
+    parser.add_argument("--ambiente", default="producao", choices=("dev", "staging", "producao"))
+    parser.add_argument("--varredura", action="store_true",
+                        help="Precificar a grade tasks × requests/dia × região × tamanho × ambiente")
+    parser.add_argument("--tasks", default="1,2,3,4,6,8,12,16",
+                        help="Números de tasks da varredura, separados por vírgula")
+    parser.add_argument("--requests-min", type=float, default=100)
+    parser.add_argument("--requests-max", type=float, default=10_000_000)
+    parser.add_argument("--requests-pontos", type=int, default=1000,
+                        help="Pontos (escala log) no eixo de requests/dia")
+    parser.add_argument("--receita-por-request", type=float,
+                        help="Receita por request para o ponto de equilíbrio")
+    parser.add_argument("--exportar", help="Arquivo .csv ou .parquet com a grade precificada")
+    parser.add_argument("--simulacao", action="store_true",
+                        help="Simular meses de tráfego com autoscaling (Monte Carlo)")
+    parser.add_argument("--meses", type=int, default=1000, help="Meses simulados")
+    parser.add_argument("--capacidade-rps", type=float,
+                        help="Capacidade por task em req/s (alternativa a --capacidade)")
+    parser.add_argument("--vcpu", type=float, default=VCPU_PADRAO)
+    parser.add_argument("--memory-gb", type=float, default=MEMORY_PADRAO_GB)
+    parser.add_argument("--max-tasks", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    
+    if args.simulacao:
+        if args.capacidade:
+            try:
+                medicoes = carregar_medicoes(args.capacidade)
+            except ValueError as e:
+                raise SystemExit(f"❌ {e}")
+            capacidade = capacidade_por_task(medicoes, args.p99_alvo, args.vcpu, args.memory_gb)
+        else:
+            capacidade = args.capacidade_rps
+        if not capacidade:
+            raise SystemExit("❌ Informe --capacidade-rps ou --capacidade com medições que atinjam o p99 alvo")
+        
+        inicio = time.perf_counter()
+        simulacao = simular_trafego(
+            args.requests_dia,
+            capacidade,
+            meses=args.meses,
+            regiao=args.regiao,
+            ambiente=args.ambiente,
+            vcpu_por_task=args.vcpu,
+            memory_por_task_gb=args.memory_gb,
+            max_tasks=args.max_tasks,
+            utilizacao_alvo=args.utilizacao,
+            seed=args.seed
+        )
+        exibir_simulacao(simulacao, time.perf_counter() - inicio)
+        return
+    
+    if args.varredura:
+        np = _importar_numpy()
+        inicio = time.perf_counter()
+        resultado = varrer_cenarios(
+            [int(t) for t in args.tasks.split(",")],
+            np.geomspace(args.requests_min, args.requests_max, args.requests_pontos),
+            receita_por_request=args.receita_por_request
+        )
+        exibir_varredura(resultado, time.perf_counter() - inicio, args.receita_por_request)
+        if args.exportar:
+            exportar_varredura(resultado, args.exportar)
+            print(f"\n💾 Grade exportada para {args.exportar}")
+        return
+    
+    if not args.capacidade:
+        main()
+        return
+    
+    try:
+        plano = planejar_capacidade(
+            carregar_medicoes(args.capacidade),
+            requests_por_dia=args.requests_dia,
+            p99_alvo_ms=args.p99_alvo,
+            pico_sobre_media=args.pico,
+            regiao=args.regiao,
+            ambiente=args.ambiente,
+            utilizacao_alvo=args.utilizacao
+        )
+    except ValueError as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
+    
+    exibir_planejamento(plano)
+
 if __name__ == "__main__":
-    main()
+    cli()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Cache de resultados de detecção - Sistema Anti-Prompt Injection V2
+Evita reprocessar prompts idênticos (templates, retries, tool calls)
+"""
+
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+# Limites configuráveis via ambiente
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 10000))
+CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 8 * 1024 * 1024))
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", 300))
+
+
+def _chave_prompt(prompt: str) -> bytes:
+    """Hash rápido do prompt normalizado (mesma normalização do detector)"""
+    return hashlib.blake2b(prompt.lower().encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+class DetectionCache:
+    """
+    Cache LRU com TTL para resultados de detect_injection.
+
+    A chave é o hash do prompt normalizado, então o texto original nunca
+    fica retido em memória. `keywords_version` devolve a versão atual do
+    conjunto de palavras-chave (por exemplo, a própria lista em uso pelo
+    detector): quando o objeto devolvido muda, o cache é esvaziado. A
+    comparação é por identidade, O(1) por consulta; quem altera a lista
+    in-place deve chamar invalidate().
+    """
+
+    def __init__(self, keywords_version: Callable[[], object], max_entries: int = CACHE_MAX_ENTRIES,
+                 max_bytes: int = CACHE_MAX_BYTES, ttl_seconds: float = CACHE_TTL_SECONDS):
+        self.keywords_version = keywords_version
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._version = keywords_version()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _tamanho_entrada(chave: bytes, word_found: Optional[str]) -> int:
+        tamanho = sys.getsizeof(chave) + 64  # tupla + float + bool
+        if word_found is not None:
+            tamanho += sys.getsizeof(word_found)
+        return tamanho
+
+    def _verificar_keywords(self) -> None:
+        version = self.keywords_version()
+        if version is not self._version:
+            self._entries.clear()
+            self._bytes = 0
+            self._version = version
+
+    def get(self, prompt: str) -> Optional[Dict]:
+        """Retorna o resultado em cache para o prompt, ou None"""
+        start_time = time.time()
+        agora = time.monotonic()
+        chave = _chave_prompt(prompt)
+
+        with self._lock:
+            self._verificar_keywords()
+            entrada = self._entries.get(chave)
+
+            if entrada is None or entrada[0] < agora:
+                if entrada is not None:
+                    self._remover(chave)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(chave)
+            self.hits += 1
+
+        processing_time = (time.time() - start_time) * 1000
+        return {
+            "detected": entrada[1],
+            "word_found": entrada[2],
+            "processing_time_ms": round(processing_time, 2),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+        }
+
+    def put(self, prompt: str, result: Dict) -> None:
+        """Armazena o resultado de detect_injection para o prompt"""
+        chave = _chave_prompt(prompt)
+        tamanho = self._tamanho_entrada(chave, result["word_found"])
+
+        if self.max_entries <= 0 or tamanho > self.max_bytes:
+            return
+
+        with self._lock:
+            self._verificar_keywords()
+            if chave in self._entries:
+                self._remover(chave)
+
+            expira_em = time.monotonic() + self.ttl_seconds
+            self._entries[chave] = (expira_em, result["detected"], result["word_found"], tamanho)
+            self._bytes += tamanho
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, entrada = self._entries.popitem(last=False)
+                self._bytes -= entrada[3]
+
+    def _remover(self, chave: bytes) -> None:
+        entrada = self._entries.pop(chave)
+        self._bytes -= entrada[3]
+
+    def invalidate(self) -> None:
+        """Descarta as entradas (conjunto de palavras-chave alterado in-place)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def clear(self) -> None:
+        """Esvazia o cache e zera os contadores"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict:
+        """Contadores e ocupação do cache"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0
+        }
+
+
+def cached_detector(detect: Callable[[str], Dict], cache: DetectionCache) -> Callable[[str], Dict]:
+    """Envolve uma função de detecção com o cache"""
+
+    def detect_with_cache(prompt: str) -> Dict:
+        result = cache.get(prompt)
+        if result is None:
+            result = detect(prompt)
+            cache.put(prompt, result)
+        return result
+
+    return detect_with_cache
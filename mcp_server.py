@@ -6,6 +6,7 @@ Expõe funcionalidades do sistema via Model Context Protocol
 
 import asyncio
 import json
+import time
 from typing import Any, Dict, List, Optional, Sequence
 from mcp.server.models import InitializationOptions
 from mcp.server import NotificationOptions, Server
@@ -19,12 +20,37 @@ from mcp.types import (
 import mcp.server.stdio
 
 # Importar módulos do sistema
+from src import detector
 from src.detector import detect_injection
 from src.keywords import KEYWORDS
+from detection_cache import DetectionCache, cached_detector
+from metrics import (
+    HANDLER_SECONDS,
+    REJECTIONS_TOTAL,
+    record_detection,
+    register_cache,
+    render_prometheus,
+    StageTimer,
+    stage_timer,
+    timed_detector
+)
+from risk_scoring import (
+    KEYWORD_CATEGORIES,
+    RISK_THRESHOLD_HIGH,
+    RISK_THRESHOLD_MEDIUM,
+    score_keywords,
+    scoring_table
+)
 
 # Criar instância do servidor MCP
 server = Server("anti-prompt-injection")
 
+# Cache de resultados compartilhado pelas ferramentas; a versão é a lista
+# em uso pelo detector, então trocar detector.KEYWORDS esvazia o cache
+detection_cache = DetectionCache(lambda: detector.KEYWORDS)
+detect_cached = cached_detector(timed_detector(detect_injection), detection_cache)
+register_cache(detection_cache)
+
 @server.list_tools()
 async def handle_list_tools() -> List[Tool]:
     """Lista as ferramentas disponíveis no MCP server"""
@@ -38,6 +64,11 @@ async def handle_list_tools() -> List[Tool]:
                     "prompt": {
                         "type": "string",
                         "description": "O prompt a ser analisado para detecção de injection"
+                    },
+                    "debug": {
+                        "type": "boolean",
+                        "description": "Incluir tempo por etapa em nanossegundos na resposta",
+                        "default": False
                     }
                 },
                 "required": ["prompt"]
@@ -54,7 +85,7 @@ async def handle_list_tools() -> List[Tool]:
         ),
         Tool(
             name="analyze_text_safety",
-            description="Análise detalhada de segurança de texto com métricas",
+            description="Análise detalhada de segurança de texto com pontuação de risco ponderada e métricas",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -66,6 +97,21 @@ async def handle_list_tools() -> List[Tool]:
                         "type": "boolean",
                         "description": "Incluir métricas detalhadas na resposta",
                         "default": False
+                    },
+                    "threshold_medium": {
+                        "type": "integer",
+                        "description": "risk_score mínimo para risco MEDIUM",
+                        "default": RISK_THRESHOLD_MEDIUM
+                    },
+                    "threshold_high": {
+                        "type": "integer",
+                        "description": "risk_score mínimo para risco HIGH",
+                        "default": RISK_THRESHOLD_HIGH
+                    },
+                    "debug": {
+                        "type": "boolean",
+                        "description": "Incluir tempo por etapa em nanossegundos na resposta",
+                        "default": False
                     }
                 },
                 "required": ["text"]
@@ -73,21 +119,55 @@ async def handle_list_tools() -> List[Tool]:
         )
     ]
 
+def parse_threshold(value: Any) -> int:
+    """Converte um limiar para int, recusando bool e floats não inteiros"""
+    if isinstance(value, bool):
+        raise ValueError("limiar booleano")
+    if isinstance(value, float) and not value.is_integer():
+        raise ValueError("limiar fracionário")
+    return int(value)
+
+def format_response(response: Dict[str, Any], timer) -> List[TextContent]:
+    """Serializa a resposta, anexando o tempo por etapa no modo debug"""
+    text = json.dumps(response, indent=2)
+    timer.mark("serialization")
+    
+    if isinstance(timer, StageTimer):
+        response["timing"] = timer.breakdown()
+        text = json.dumps(response, indent=2)
+    
+    return [TextContent(type="text", text=text)]
+
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
     """Manipula chamadas de ferramentas"""
+    start_ns = time.perf_counter_ns()
+    try:
+        return await call_tool(name, arguments)
+    finally:
+        HANDLER_SECONDS.observe_ns(time.perf_counter_ns() - start_ns)
+
+async def call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[TextContent | ImageContent | EmbeddedResource]:
+    """Executa a ferramenta solicitada"""
+    
+    timer = stage_timer(arguments.get("debug") is True)
     
     if name == "check_prompt_injection":
         prompt = arguments.get("prompt", "")
         
         if not prompt:
+            REJECTIONS_TOTAL.inc(1, "empty_input")
             return [TextContent(
                 type="text",
                 text="Erro: Prompt não pode estar vazio"
             )]
         
+        timer.mark("validation")
+        
         # Executar detecção
-        result = detect_injection(prompt)
+        result = detect_cached(prompt)
+        timer.mark("detection")
+        record_detection(prompt, result)
         
         # Formatar resposta
         response = {
@@ -98,11 +178,9 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
             "prompt_length": len(prompt),
             "status": "INJECTION_DETECTED" if result["detected"] else "SAFE"
         }
+        timer.mark("response")
         
-        return [TextContent(
-            type="text",
-            text=json.dumps(response, indent=2)
-        )]
+        return format_response(response, timer)
     
     elif name == "get_monitored_keywords":
         response = {
@@ -121,13 +199,48 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
         include_metrics = arguments.get("include_metrics", False)
         
         if not text:
+            REJECTIONS_TOTAL.inc(1, "empty_input")
             return [TextContent(
                 type="text",
                 text="Erro: Texto não pode estar vazio"
             )]
         
+        try:
+            threshold_medium = parse_threshold(arguments.get("threshold_medium", RISK_THRESHOLD_MEDIUM))
+            threshold_high = parse_threshold(arguments.get("threshold_high", RISK_THRESHOLD_HIGH))
+        except (TypeError, ValueError):
+            REJECTIONS_TOTAL.inc(1, "invalid_threshold")
+            return [TextContent(
+                type="text",
+                text="Erro: threshold_medium e threshold_high devem ser inteiros"
+            )]
+        
+        if not 0 <= threshold_medium <= threshold_high <= 100:
+            REJECTIONS_TOTAL.inc(1, "invalid_threshold")
+            return [TextContent(
+                type="text",
+                text="Erro: Limiares devem satisfazer 0 <= threshold_medium <= threshold_high <= 100"
+            )]
+        
+        timer.mark("validation")
+        
         # Executar análise
-        result = detect_injection(text)
+        result = detect_cached(text)
+        timer.mark("detection")
+        record_detection(text, result)
+        
+        # Pontuação ponderada (só há o que pontuar se houve detecção)
+        detected_keywords = []
+        if result["detected"]:
+            normalized_text = text.lower()
+            detected_keywords = [kw for kw in KEYWORDS if kw in normalized_text]
+        
+        score = score_keywords(
+            detected_keywords,
+            threshold_medium=threshold_medium,
+            threshold_high=threshold_high
+        )
+        timer.mark("scoring")
         
         # Análise básica
         response = {
@@ -135,14 +248,15 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
             "detected": result["detected"],
             "word_found": result["word_found"],
             "processing_time_ms": result["processing_time_ms"],
-            "safety_score": 0 if result["detected"] else 100,
-            "risk_level": "HIGH" if result["detected"] else "LOW"
+            "safety_score": score["safety_score"],
+            "risk_score": score["risk_score"],
+            "risk_level": score["risk_level"],
+            "category_scores": score["category_scores"]
         }
         
         # Métricas detalhadas se solicitado
         if include_metrics:
             words = text.lower().split()
-            detected_keywords = [kw for kw in KEYWORDS if kw in text.lower()]
             
             response["metrics"] = {
                 "word_count": len(words),
@@ -151,11 +265,9 @@ async def handle_call_tool(name: str, arguments: Dict[str, Any]) -> Sequence[Tex
                 "detection_ratio": len(detected_keywords) / len(KEYWORDS) * 100,
                 "algorithm_complexity": f"O(n*m) where n={len(text)}, m={len(KEYWORDS)}"
             }
+        timer.mark("response")
         
-        return [TextContent(
-            type="text",
-            text=json.dumps(response, indent=2)
-        )]
+        return format_response(response, timer)
     
     else:
         return [TextContent(
@@ -178,6 +290,12 @@ async def handle_list_resources() -> List[Resource]:
             name="Keywords List",
             description="Lista completa das palavras-chave monitoradas",
             mimeType="application/json"
+        ),
+        Resource(
+            uri="anti-prompt-injection://metrics",
+            name="Metrics",
+            description="Métricas de latência, tamanho de prompt, detecções e cache no formato Prometheus",
+            mimeType="text/plain"
         )
     ]
 
@@ -198,6 +316,7 @@ async def handle_read_resource(uri: str) -> str:
             },
             "keywords_count": len(KEYWORDS),
             "case_sensitive": False,
+            "cache": detection_cache.stats(),
             "supported_languages": ["Portuguese", "English"]
         }
         return json.dumps(info, indent=2)
@@ -206,17 +325,20 @@ async def handle_read_resource(uri: str) -> str:
         keywords_info = {
             "keywords": KEYWORDS,
             "total": len(KEYWORDS),
-            "categories": {
-                "control": ["ignore", "forget", "override", "bypass"],
-                "system": ["system", "admin", "command"],
-                "security": ["jailbreak"],
-                "instruction": ["prompt", "instruction"]
+            "categories": KEYWORD_CATEGORIES,
+            "weights": scoring_table(KEYWORDS),
+            "risk_thresholds": {
+                "medium": RISK_THRESHOLD_MEDIUM,
+                "high": RISK_THRESHOLD_HIGH
             },
             "detection_method": "substring_match",
             "case_sensitive": False
         }
         return json.dumps(keywords_info, indent=2)
     
+    elif uri == "anti-prompt-injection://metrics":
+        return render_prometheus()
+    
     else:
         raise ValueError(f"Recurso não encontrado: {uri}")
 
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Métricas no formato Prometheus - Sistema Anti-Prompt Injection V2
+Registro único compartilhado pelos front-ends (API REST e MCP server)
+"""
+
+import threading
+from bisect import bisect_left
+from time import perf_counter_ns
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Buckets de latência em segundos (10µs a 1s)
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0
+)
+
+# Buckets de tamanho de prompt em caracteres
+SIZE_BUCKETS = (16, 64, 256, 1024, 4096, 10000, 65536, 262144, 1048576)
+
+
+def _formatar_labels(label_names: Sequence[str], label_values: Sequence[str]) -> str:
+    if not label_names:
+        return ""
+    pares = []
+    for nome, valor in zip(label_names, label_values):
+        valor = str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pares.append(f'{nome}="{valor}"')
+    return "{" + ",".join(pares) + "}"
+
+
+def _formatar_valor(valor: float) -> str:
+    if valor == float("inf"):
+        return "+Inf"
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+class Counter:
+    """Contador monotônico, opcionalmente com labels"""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *label_values: str) -> None:
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def render(self) -> List[str]:
+        linhas = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for label_values, valor in sorted(self._values.items()):
+            labels = _formatar_labels(self.label_names, label_values)
+            linhas.append(f"{self.name}{labels} {_formatar_valor(valor)}")
+        return linhas
+
+
+class Histogram:
+    """Histograma com buckets cumulativos fixos"""
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float]):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        indice = bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[indice] += 1
+            self._sum += value
+            self._count += 1
+
+    def observe_ns(self, elapsed_ns: int) -> None:
+        """Registra uma duração medida com perf_counter_ns (em segundos)"""
+        self.observe(elapsed_ns / 1e9)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def render(self) -> List[str]:
+        linhas = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        acumulado = 0
+        for limite, quantidade in zip(self.buckets + (float("inf"),), self._counts):
+            acumulado += quantidade
+            linhas.append(f'{self.name}_bucket{{le="{_formatar_valor(float(limite))}"}} {acumulado}')
+        linhas.append(f"{self.name}_sum {_formatar_valor(self._sum)}")
+        linhas.append(f"{self.name}_count {self._count}")
+        return linhas
+
+
+class Registry:
+    """Coleção de métricas renderizada no formato texto do Prometheus"""
+
+    def __init__(self):
+        self._metrics: List = []
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], List[str]]) -> None:
+        """Registra uma função que gera linhas no momento da coleta"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        linhas: List[str] = []
+        for metric in self._metrics:
+            linhas.extend(metric.render())
+        for collector in self._collectors:
+            linhas.extend(collector())
+        return "\n".join(linhas) + "\n"
+
+
+REGISTRY = Registry()
+
+ENGINE_SECONDS = REGISTRY.register(Histogram(
+    "antiprompt_engine_seconds",
+    "Tempo gasto em detect_injection",
+    LATENCY_BUCKETS
+))
+HANDLER_SECONDS = REGISTRY.register(Histogram(
+    "antiprompt_handler_seconds",
+    "Tempo total do handler, da entrada à resposta serializada",
+    LATENCY_BUCKETS
+))
+PROMPT_SIZE_CHARS = REGISTRY.register(Histogram(
+    "antiprompt_prompt_size_chars",
+    "Tamanho dos prompts analisados em caracteres",
+    SIZE_BUCKETS
+))
+DETECTIONS_TOTAL = REGISTRY.register(Counter(
+    "antiprompt_detections_total",
+    "Prompts com injection detectada, por palavra-chave",
+    ("keyword",)
+))
+REJECTIONS_TOTAL = REGISTRY.register(Counter(
+    "antiprompt_rejections_total",
+    "Requisições rejeitadas antes da detecção, por motivo",
+    ("reason",)
+))
+
+
+def register_cache(cache, registry: Optional[Registry] = None) -> None:
+    """Publica os contadores de um DetectionCache no registro"""
+
+    def coletar_cache() -> List[str]:
+        stats = cache.stats()
+        return [
+            "# HELP antiprompt_cache_hits_total Consultas atendidas pelo cache",
+            "# TYPE antiprompt_cache_hits_total counter",
+            f"antiprompt_cache_hits_total {stats['hits']}",
+            "# HELP antiprompt_cache_misses_total Consultas que exigiram detecção",
+            "# TYPE antiprompt_cache_misses_total counter",
+            f"antiprompt_cache_misses_total {stats['misses']}",
+            "# HELP antiprompt_cache_entries Entradas atualmente no cache",
+            "# TYPE antiprompt_cache_entries gauge",
+            f"antiprompt_cache_entries {stats['entries']}"
+        ]
+
+    (registry or REGISTRY).register_collector(coletar_cache)
+
+
+def render_prometheus() -> str:
+    """Texto de exposição do registro compartilhado"""
+    return REGISTRY.render()
+
+
+def timed_detector(detect: Callable[[str], Dict], histogram: Histogram = ENGINE_SECONDS) -> Callable[[str], Dict]:
+    """Envolve uma função de detecção medindo o tempo com perf_counter_ns"""
+
+    def detect_with_timing(prompt: str) -> Dict:
+        start_ns = perf_counter_ns()
+        result = detect(prompt)
+        histogram.observe_ns(perf_counter_ns() - start_ns)
+        return result
+
+    return detect_with_timing
+
+
+def record_detection(prompt: str, result: Dict) -> None:
+    """Registra tamanho do prompt e palavra-chave detectada"""
+    PROMPT_SIZE_CHARS.observe(len(prompt))
+    if result["detected"]:
+        DETECTIONS_TOTAL.inc(1, result["word_found"])
+
+
+class StageTimer:
+    """Decomposição do tempo por etapa, em nanossegundos (modo debug)"""
+
+    __slots__ = ("_start", "_last", "stages")
+
+    def __init__(self):
+        self._start = self._last = perf_counter_ns()
+        self.stages: Dict[str, int] = {}
+
+    def mark(self, stage: str) -> None:
+        """Fecha a etapa atual com o nome informado"""
+        now = perf_counter_ns()
+        self.stages[stage] = now - self._last
+        self._last = now
+
+    def breakdown(self) -> Dict:
+        return {"stages_ns": dict(self.stages), "total_ns": self._last - self._start}
+
+
+class _NullStageTimer:
+    """Timer sem efeito usado fora do modo debug"""
+
+    __slots__ = ()
+
+    def mark(self, stage: str) -> None:
+        pass
+
+
+NULL_STAGE_TIMER = _NullStageTimer()
+
+
+def stage_timer(enabled: bool):
+    """StageTimer real apenas quando o detalhamento foi solicitado"""
+    return StageTimer() if enabled else NULL_STAGE_TIMER
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Motor de pontuação de risco - Sistema Anti-Prompt Injection V2
+Atribui peso e categoria a cada palavra-chave e agrega o risco por categoria
+"""
+
+import os
+from typing import Dict, List, Sequence
+
+# Categorias das palavras-chave monitoradas
+KEYWORD_CATEGORIES = {
+    "control": ["ignore", "forget", "override", "bypass"],
+    "system": ["system", "admin", "command"],
+    "security": ["jailbreak"],
+    "instruction": ["prompt", "instruction"]
+}
+
+# Peso de cada palavra-chave (0-100)
+KEYWORD_WEIGHTS = {
+    "ignore": 40,
+    "forget": 35,
+    "override": 45,
+    "bypass": 45,
+    "system": 25,
+    "admin": 30,
+    "command": 20,
+    "jailbreak": 60,
+    "prompt": 15,
+    "instruction": 20
+}
+
+# Peso aplicado a palavras-chave sem entrada em KEYWORD_WEIGHTS
+DEFAULT_WEIGHT = int(os.getenv("RISK_DEFAULT_WEIGHT", 25))
+
+# Limiares de classificação do risk_score
+RISK_THRESHOLD_MEDIUM = int(os.getenv("RISK_THRESHOLD_MEDIUM", 20))
+RISK_THRESHOLD_HIGH = int(os.getenv("RISK_THRESHOLD_HIGH", 50))
+
+_CATEGORIA_POR_KEYWORD = {
+    keyword: categoria
+    for categoria, keywords in KEYWORD_CATEGORIES.items()
+    for keyword in keywords
+}
+
+
+def keyword_category(keyword: str) -> str:
+    """Categoria da palavra-chave ("other" se não categorizada)"""
+    return _CATEGORIA_POR_KEYWORD.get(keyword, "other")
+
+
+def score_keywords(keywords_found: Sequence[str],
+                   threshold_medium: int = RISK_THRESHOLD_MEDIUM,
+                   threshold_high: int = RISK_THRESHOLD_HIGH) -> Dict:
+    """
+    Calcula o risco a partir das palavras-chave encontradas.
+
+    Args:
+        keywords_found: Palavras-chave detectadas no texto
+        threshold_medium: risk_score mínimo para risco MEDIUM
+        threshold_high: risk_score mínimo para risco HIGH
+
+    Returns:
+        Dict com risk_score, safety_score, risk_level e pontuação por categoria
+    """
+    category_scores: Dict[str, int] = {}
+    for keyword in keywords_found:
+        categoria = keyword_category(keyword)
+        peso = KEYWORD_WEIGHTS.get(keyword, DEFAULT_WEIGHT)
+        category_scores[categoria] = category_scores.get(categoria, 0) + peso
+
+    risk_score = min(100, sum(category_scores.values()))
+
+    if risk_score >= threshold_high:
+        risk_level = "HIGH"
+    elif risk_score >= threshold_medium:
+        risk_level = "MEDIUM"
+    else:
+        risk_level = "LOW"
+
+    return {
+        "risk_score": risk_score,
+        "safety_score": 100 - risk_score,
+        "risk_level": risk_level,
+        "category_scores": category_scores
+    }
+
+
+def scoring_table(keywords: Sequence[str]) -> List[Dict]:
+    """Tabela de peso e categoria das palavras-chave informadas"""
+    return [
+        {
+            "keyword": keyword,
+            "category": keyword_category(keyword),
+            "weight": KEYWORD_WEIGHTS.get(keyword, DEFAULT_WEIGHT)
+        }
+        for keyword in keywords
+    ]
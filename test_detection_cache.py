@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Testes do cache de detecção (LRU, limite de bytes, TTL e troca de keywords)
+"""
+
+import os
+import sys
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+import detection_cache
+from detection_cache import DetectionCache, cached_detector
+
+
+def fake_detector(keywords=("ignore", "admin")):
+    """Detector com a mesma semântica de src.detector, lendo KEYWORDS do módulo"""
+    modulo = types.SimpleNamespace(KEYWORDS=list(keywords), chamadas=0)
+
+    def detect(prompt):
+        modulo.chamadas += 1
+        normalized = prompt.lower()
+        for keyword in modulo.KEYWORDS:
+            if keyword in normalized:
+                return {"detected": True, "word_found": keyword}
+        return {"detected": False, "word_found": None}
+
+    return modulo, detect
+
+
+def test_hit_and_normalization():
+    modulo, detect = fake_detector()
+    cache = DetectionCache(lambda: modulo.KEYWORDS)
+    detect_cached = cached_detector(detect, cache)
+
+    assert detect_cached("IGNORE this")["word_found"] == "ignore"
+    result = detect_cached("ignore THIS")
+    assert result["detected"] is True
+    assert result["word_found"] == "ignore"
+    assert modulo.chamadas == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction():
+    modulo, detect = fake_detector()
+    cache = DetectionCache(lambda: modulo.KEYWORDS, max_entries=2)
+
+    cache.put("a", detect("a"))
+    cache.put("b", detect("b"))
+    assert cache.get("a") is not None  # "a" passa a ser o mais recente
+    cache.put("c", detect("c"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.stats()["entries"] == 2
+
+
+def test_byte_budget():
+    modulo, detect = fake_detector()
+    tamanho = DetectionCache._tamanho_entrada(detection_cache._chave_prompt("x"), None)
+    cache = DetectionCache(lambda: modulo.KEYWORDS, max_bytes=tamanho * 3)
+
+    for i in range(10):
+        cache.put(f"prompt {i}", detect(f"prompt {i}"))
+
+    stats = cache.stats()
+    assert stats["entries"] == 3
+    assert stats["bytes"] <= stats["max_bytes"]
+    assert cache.get("prompt 9") is not None
+    assert cache.get("prompt 0") is None
+
+
+def test_disabled_when_max_entries_zero():
+    modulo, detect = fake_detector()
+    cache = DetectionCache(lambda: modulo.KEYWORDS, max_entries=0)
+    cache.put("ignore", detect("ignore"))
+    assert cache.get("ignore") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_ttl_expiry(monkeypatch):
+    modulo, detect = fake_detector()
+    agora = [1000.0]
+    monkeypatch.setattr(detection_cache.time, "monotonic", lambda: agora[0])
+    cache = DetectionCache(lambda: modulo.KEYWORDS, ttl_seconds=10)
+
+    cache.put("ignore", detect("ignore"))
+    agora[0] += 9
+    assert cache.get("ignore") is not None
+    agora[0] += 2
+    assert cache.get("ignore") is None
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["bytes"] == 0
+
+
+def test_keyword_set_rebinding_clears_cache():
+    modulo, detect = fake_detector()
+    detect_cached = cached_detector(detect, DetectionCache(lambda: modulo.KEYWORDS))
+
+    assert detect_cached("hello zzz")["detected"] is False
+    modulo.KEYWORDS = modulo.KEYWORDS + ["zzz"]
+
+    result = detect_cached("hello zzz")
+    assert result["detected"] is True
+    assert result["word_found"] == "zzz"
+
+
+def test_invalidate_after_in_place_change():
+    modulo, detect = fake_detector()
+    cache = DetectionCache(lambda: modulo.KEYWORDS)
+    detect_cached = cached_detector(detect, cache)
+
+    assert detect_cached("hello zzz")["detected"] is False
+    modulo.KEYWORDS.append("zzz")
+    cache.invalidate()
+
+    assert detect_cached("hello zzz")["detected"] is True
+    assert modulo.chamadas == 2
+
+
+def test_clear_resets_counters():
+    modulo, detect = fake_detector()
+    cache = DetectionCache(lambda: modulo.KEYWORDS)
+    detect_cached = cached_detector(detect, cache)
+    detect_cached("ignore")
+    detect_cached("ignore")
+
+    cache.clear()
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["hits"], stats["misses"]) == (0, 0, 0, 0)
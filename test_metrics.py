@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Testes do registro de métricas no formato Prometheus
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from detection_cache import DetectionCache, cached_detector
+from metrics import Counter, Histogram, Registry, _formatar_labels, timed_detector
+
+
+def test_value_on_bound_lands_in_that_bucket():
+    histogram = Histogram("h", "teste", (1, 5, 10))
+    histogram.observe(5)
+
+    linhas = histogram.render()
+    assert 'h_bucket{le="1.0"} 0' in linhas
+    assert 'h_bucket{le="5.0"} 1' in linhas
+    assert 'h_bucket{le="10.0"} 1' in linhas
+
+
+def test_inf_sum_and_count():
+    histogram = Histogram("h", "teste", (1, 5))
+    for valor in (0.5, 3, 50):
+        histogram.observe(valor)
+
+    linhas = histogram.render()
+    assert linhas[:2] == ["# HELP h teste", "# TYPE h histogram"]
+    assert 'h_bucket{le="1.0"} 1' in linhas
+    assert 'h_bucket{le="5.0"} 2' in linhas
+    assert 'h_bucket{le="+Inf"} 3' in linhas
+    assert "h_sum 53.5" in linhas
+    assert "h_count 3" in linhas
+
+
+def test_observe_ns_records_seconds():
+    histogram = Histogram("h", "teste", (0.001,))
+    histogram.observe_ns(500_000)
+    assert 'h_bucket{le="0.001"} 1' in histogram.render()
+    assert "h_sum 0.0005" in histogram.render()
+
+
+def test_label_escaping():
+    labels = _formatar_labels(("keyword",), ('a"b\\c\nd',))
+    assert labels == '{keyword="a\\"b\\\\c\\nd"}'
+
+
+def test_counter_with_labels_in_registry():
+    registry = Registry()
+    counter = registry.register(Counter("c_total", "teste", ("reason",)))
+    counter.inc(1, "empty_input")
+    counter.inc(2, "empty_input")
+    registry.register_collector(lambda: ["extra 1"])
+
+    texto = registry.render()
+    assert 'c_total{reason="empty_input"} 3' in texto
+    assert texto.endswith("extra 1\n")
+
+
+def test_timed_detector_observes_only_cache_misses():
+    keywords = ["ignore"]
+    histogram = Histogram("engine", "teste", (1.0,))
+
+    def detect(prompt):
+        return {"detected": "ignore" in prompt.lower(), "word_found": None}
+
+    cache = DetectionCache(lambda: keywords)
+    detect_cached = cached_detector(timed_detector(detect, histogram), cache)
+
+    detect_cached("ignore this")
+    detect_cached("ignore this")
+    detect_cached("something else")
+
+    assert histogram.count == 2
+    assert cache.stats()["hits"] == 1
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Testes do motor de pontuação de risco
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__)))
+
+from risk_scoring import (
+    DEFAULT_WEIGHT,
+    KEYWORD_WEIGHTS,
+    keyword_category,
+    score_keywords,
+    scoring_table
+)
+
+
+def test_no_keywords_is_low():
+    score = score_keywords([])
+    assert score == {"risk_score": 0, "safety_score": 100, "risk_level": "LOW", "category_scores": {}}
+
+
+def test_bands():
+    assert score_keywords(["prompt"])["risk_level"] == "LOW"        # 15
+    assert score_keywords(["instruction"])["risk_level"] == "MEDIUM"  # 20, no limiar
+    assert score_keywords(["forget"])["risk_level"] == "MEDIUM"     # 35
+    assert score_keywords(["jailbreak"])["risk_level"] == "HIGH"    # 60
+
+
+def test_custom_thresholds():
+    assert score_keywords(["forget"], threshold_medium=40, threshold_high=80)["risk_level"] == "LOW"
+    assert score_keywords(["forget"], threshold_medium=10, threshold_high=30)["risk_level"] == "HIGH"
+
+
+def test_category_sums():
+    score = score_keywords(["ignore", "bypass", "system", "prompt"])
+    assert score["category_scores"] == {
+        "control": KEYWORD_WEIGHTS["ignore"] + KEYWORD_WEIGHTS["bypass"],
+        "system": KEYWORD_WEIGHTS["system"],
+        "instruction": KEYWORD_WEIGHTS["prompt"]
+    }
+
+
+def test_clamped_at_100():
+    score = score_keywords(["jailbreak", "override", "bypass"])
+    assert sum(score["category_scores"].values()) == 150
+    assert score["risk_score"] == 100
+    assert score["safety_score"] == 0
+    assert score["risk_level"] == "HIGH"
+
+
+def test_unknown_keyword_uses_default_weight():
+    score = score_keywords(["zzz"])
+    assert keyword_category("zzz") == "other"
+    assert score["category_scores"] == {"other": DEFAULT_WEIGHT}
+
+
+def test_scoring_table():
+    assert scoring_table(["admin"]) == [{"keyword": "admin", "category": "system", "weight": 30}]